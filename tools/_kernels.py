@@ -0,0 +1,95 @@
+"""
+Compiled kernels for the particle tools. Numba is optional: without it
+every kernel falls back to plain numpy. Numba is only imported the first
+time a kernel is actually needed, so importing this module stays cheap.
+"""
+
+import functools
+
+import numpy as np
+
+# Below this many particles numpy's reductions win, and the one-off JIT
+# compile (when the on-disk cache is cold) would dominate anyway
+NUMBA_MIN_PARTICLES = 1_000_000
+
+
+def _pos_stats_numpy(pos, pad):
+    lo = pos.min(axis=1)
+    hi = pos.max(axis=1)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    bbox = np.column_stack([lo - pad * span, hi + pad * span])
+    return lo, hi, bbox
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_pos_stats():
+    # Import numba and build the jitted kernel on first use. Returns None
+    # when numba isn't installed.
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    # No fastmath: min/max must propagate NaN exactly like np.min/np.max.
+    @njit(parallel=True, cache=True)
+    def _pos_stats_numba(pos, pad, nthreads):
+        # nthreads comes from the caller: numba.get_num_threads() inside
+        # the kernel would stop it from being cached to disk
+        n = pos.shape[1]
+        chunk = (n + nthreads - 1) // nthreads
+        nchunks = (n + chunk - 1) // chunk
+
+        # Per-chunk (min, max) for each axis, reduced serially below.
+        # "v != v" picks up a NaN, after which comparisons keep it.
+        partial = np.empty((nchunks, 2, 3))
+        for c in prange(nchunks):
+            start = c * chunk
+            stop = min(start + chunk, n)
+            for d in range(3):
+                lo = pos[d, start]
+                hi = lo
+                for i in range(start + 1, stop):
+                    v = pos[d, i]
+                    if v < lo or v != v:
+                        lo = v
+                    if v > hi or v != v:
+                        hi = v
+                partial[c, 0, d] = lo
+                partial[c, 1, d] = hi
+
+        lo = partial[0, 0].copy()
+        hi = partial[0, 1].copy()
+        for c in range(1, nchunks):
+            for d in range(3):
+                v = partial[c, 0, d]
+                if v < lo[d] or v != v:
+                    lo[d] = v
+                v = partial[c, 1, d]
+                if v > hi[d] or v != v:
+                    hi[d] = v
+
+        bbox = np.empty((3, 2))
+        for d in range(3):
+            span = hi[d] - lo[d] if hi[d] > lo[d] else 1.0
+            bbox[d, 0] = lo[d] - pad * span
+            bbox[d, 1] = hi[d] + pad * span
+        return lo, hi, bbox
+
+    return _pos_stats_numba
+
+
+def pos_stats(pos, pad=0.05):
+    """
+    Return (lo, hi, bbox) for a contiguous (3, npart) position array:
+    per-axis min and max, and the bounding box padded by `pad` times the
+    extent on each side (1.0 is used for a zero extent).
+    """
+    if pos.shape[1] < NUMBA_MIN_PARTICLES:
+        return _pos_stats_numpy(pos, pad)
+
+    kernel = _numba_pos_stats()
+    if kernel is None:
+        return _pos_stats_numpy(pos, pad)
+
+    import numba
+    return kernel(pos, pad, numba.get_num_threads())
@@ -0,0 +1,278 @@
+"""
+Shared reader for AMReX particle output (Header + DATA_xxxxx files),
+used by load_parts.py and manualparticle.py.
+
+Only numpy is needed to read the data; yt is imported lazily by
+build_yt_dataset() and show_yt_dataset().
+"""
+
+import argparse
+import functools
+import os
+import numpy as np
+
+from _kernels import pos_stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inspect AMReX particle data.")
+    parser.add_argument(
+        "--no-yt", dest="use_yt", action="store_false",
+        help="print diagnostics straight from the raw arrays, skip building a yt dataset",
+    )
+    return parser.parse_args()
+
+
+def read_header(filename="Header"):
+    """
+    Read the AMReX particle Header file (Version_Two_Dot_One_double)
+    and return basic info + real component names.
+    """
+    # Parsed headers are cached, which pays off when looping over many
+    # plotfiles. The key is the absolute path plus mtime (ns) and size, so
+    # a relative "Header" in another directory, or a copy with preserved
+    # mtime, is never served the wrong entry. The cached value holds
+    # real_names as a tuple; each caller gets a fresh dict with its own list.
+    path = os.path.abspath(filename)
+    st = os.stat(path)
+    header_info = dict(_parse_header(path, st.st_mtime_ns, st.st_size))
+    header_info["real_names"] = list(header_info["real_names"])
+    return header_info
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_header(filename, mtime_ns, size):
+    # Read and split the whole file in one go. Every entry we use below
+    # sits alone on its own line, so whitespace tokens can be indexed
+    # exactly like the stripped, non-blank lines.
+    with open(filename, "rb") as f:
+        lines = f.read().decode("ascii", "replace").split()
+
+    version = lines[0]
+    ndim = int(lines[1])
+    nreal = int(lines[2])
+    real_names = tuple(lines[3 : 3 + nreal])
+
+    nint = int(lines[3 + nreal])
+    nlev = int(lines[4 + nreal])
+    npart_total = int(lines[5 + nreal])
+    next_id = int(lines[6 + nreal])
+
+    # The rest is per-level / per-grid info, which we don't strictly need
+    header_info = {
+        "version": version,
+        "ndim": ndim,
+        "nreal": nreal,
+        "real_names": real_names,
+        "nint": nint,
+        "nlev": nlev,
+        "npart_total": npart_total,
+        "next_id": next_id,
+    }
+    return header_info
+
+
+def read_data_soa(header, data_filename="DATA_00000"):
+    """
+    Read an AMReX particle DATA file, assuming:
+    - native endian float64 for positions + real components
+    - each particle has: 3 coords + nreal real comps, all doubles
+    - trailing 8 bytes per particle (likely id/cpu) are ignored
+
+    Returns a dict of contiguous arrays: "pos" of shape (3, npart),
+    "x", "y", "z" of shape (npart,) (rows of "pos") and "reals" of
+    shape (nreal, npart).
+    """
+    npart = header["npart_total"]
+    nreal = header["nreal"]
+
+    # Size of the file
+    filesize = os.path.getsize(data_filename)
+
+    # From your files: filesize / npart = 80 bytes per particle
+    # We read only the first (3 + nreal) doubles = 9 doubles = 72 bytes.
+    # The remaining 8 bytes per particle (id/cpu) we ignore.
+    n_doubles_per_particle = 3 + nreal
+    bytes_per_particle_we_read = n_doubles_per_particle * 8
+    row_bytes = filesize // npart
+
+    if bytes_per_particle_we_read > row_bytes:
+        raise RuntimeError(
+            f"Not enough bytes per particle to read {n_doubles_per_particle} doubles "
+            f"(file has {row_bytes} bytes/particle)."
+        )
+    if row_bytes * npart != filesize:
+        raise RuntimeError(
+            f"File size {filesize} is not a multiple of {npart} particles. "
+            "File may be truncated."
+        )
+
+    # rows of the result: x, y, z, real0, real1, ..., real(nreal-1)
+    if row_bytes == bytes_per_particle_we_read:
+        # Rows hold exactly the doubles we want (no id/cpu tail), so the
+        # file can be streamed chunk by chunk into the SoA result.
+        cols = _read_packed_soa(data_filename, npart, n_doubles_per_particle)
+    else:
+        # Memory-map the file as raw bytes with the full on-disk row stride
+        # (80 bytes per particle), keep the first (3 + nreal) * 8 bytes of
+        # each row and reinterpret them as doubles. This is a strided view,
+        # so the id/cpu tail is never read as data and no intermediate
+        # buffer is allocated; the OS pages data in lazily as the
+        # transpose below touches it.
+        mm = np.memmap(data_filename, dtype=np.uint8, mode="r",
+                       shape=(npart, row_bytes))
+        data = mm[:, :bytes_per_particle_we_read].view(np.float64)
+
+        # Transpose once into structure-of-arrays layout so that every
+        # component is a contiguous 1-D array. This is the only copy.
+        cols = np.ascontiguousarray(data.T)
+
+    return {"pos": cols[:3], "x": cols[0], "y": cols[1], "z": cols[2], "reals": cols[3:]}
+
+
+def _read_packed_soa(filename, npart, ncols, chunk_bytes=64 * 1024 * 1024):
+    # Read packed rows of `ncols` float64 values with readinto on an
+    # unbuffered file, ~64 MiB of rows at a time, and transpose each chunk
+    # into a preallocated (ncols, npart) array. The result is the only
+    # full-size allocation.
+    cols = np.empty((ncols, npart), dtype=np.float64)
+    rows_per_chunk = max(1, chunk_bytes // (ncols * 8))
+    chunk = np.empty((rows_per_chunk, ncols), dtype=np.float64)
+    view = memoryview(chunk).cast("B")
+
+    with open(filename, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        for start in range(0, npart, rows_per_chunk):
+            nrows = min(rows_per_chunk, npart - start)
+            nbytes = nrows * ncols * 8
+            offset = 0
+            while offset < nbytes:
+                n = f.readinto(view[offset:nbytes])
+                if not n:
+                    break
+                offset += n
+            if offset < nbytes:
+                # The file shrank or was replaced after the size check
+                raise RuntimeError(
+                    f"Expected {npart * ncols} doubles, got "
+                    f"{(start * ncols * 8 + offset) // 8}. File may be truncated."
+                )
+            cols[:, start : start + nrows] = chunk[:nrows].T
+
+    return cols
+
+
+def build_yt_dataset(header, soa, length_unit="cm", ptype="io"):
+    """
+    Build a yt particle dataset (stream frontend) from the arrays returned
+    by read_data_soa(). The domain is the particle bounding box with 5%
+    padding on each side.
+    """
+    import yt
+
+    # Try to import load_particles from the stream frontend (yt >=4),
+    # fall back to yt.load_particles if available.
+    try:
+        from yt.frontends.stream.data_structures import load_particles
+    except Exception:
+        load_particles = yt.load_particles
+
+    # One fused pass over the contiguous (3, npart) position block
+    _, _, bbox = pos_stats(soa["pos"], pad=0.05)
+
+    # Every value is a contiguous 1-D row of the SoA buffer, so yt does
+    # not need to make its own contiguous copy.
+    pt_data = {
+        (ptype, "particle_position_x"): soa["x"],
+        (ptype, "particle_position_y"): soa["y"],
+        (ptype, "particle_position_z"): soa["z"],
+        **{(ptype, f"particle_{name}"): row
+           for name, row in zip(header["real_names"], soa["reals"])},
+    }
+
+    return load_particles(pt_data, bbox=bbox, length_unit=length_unit)
+
+
+def inspect(header, soa):
+    """
+    Print basic diagnostics straight from the arrays returned by
+    read_data_soa(), without building a yt dataset.
+    """
+    pos = soa["pos"]
+    lo, hi, _ = pos_stats(pos)
+    print("\nNumber of particles:", pos.shape[1])
+    print("Position min (x,y,z):", lo)
+    print("Position max (x,y,z):", hi)
+
+    print("\nFirst 5 particles (x,y,z):")
+    print(np.array2string(pos[:, :5].T, formatter={"float_kind": "{:.6e}".format}))
+
+    print("\nFirst 5 values of each real component:")
+    for name, row in zip(header["real_names"], soa["reals"]):
+        print(f"  particle_{name}:", np.array2string(row[:5], formatter={"float_kind": "{:.3e}".format}))
+
+
+def show_yt_dataset(header, soa, ptype="io"):
+    """
+    Build the yt particle dataset and print what yt sees.
+    """
+    ds = build_yt_dataset(header, soa, length_unit="cm", ptype=ptype)
+    print("\n=== yt dataset created ===")
+    print("Dataset:", ds)
+    print("Current time:", ds.current_time)
+    print("Domain left edge:", ds.domain_left_edge)
+    print("Domain right edge:", ds.domain_right_edge)
+
+    ad = ds.all_data()
+    npart_ds = ad[ptype, "particle_position_x"].size
+    print("\nNumber of particles in yt dataset:", int(npart_ds))
+
+    print("\nFirst 5 particles (x,y,z):")
+    xs5 = ad[ptype, "particle_position_x"][:5].v
+    ys5 = ad[ptype, "particle_position_y"][:5].v
+    zs5 = ad[ptype, "particle_position_z"][:5].v
+    print(np.array2string(np.column_stack([xs5, ys5, zs5]),
+                          formatter={"float_kind": "{:.6e}".format}))
+
+    print("\nFirst 5 values of each real component:")
+    for name in header["real_names"]:
+        field_name = f"particle_{name}"
+        vals = ad[ptype, field_name][:5].v
+        print(f"  {field_name}:", np.array2string(vals, formatter={"float_kind": "{:.3e}".format}))
+
+
+def plot_xy(x, y, filename="particle_xy.png", max_points=20000):
+    """
+    Save an x-y plot of (at most max_points randomly chosen) particles.
+    """
+    try:
+        # Draw on a standalone Figure with the Agg canvas rather than
+        # through pyplot, so the caller's matplotlib backend is untouched
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        n = x.size
+        if n > max_points:
+            rng = np.random.default_rng()
+            idx = rng.choice(n, size=max_points, replace=False, shuffle=False)
+        else:
+            idx = np.arange(n)
+
+        xs = x[idx]
+        ys = y[idx]
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.plot(xs, ys, ",k", alpha=0.5, rasterized=True)
+        ax.set_xlabel("x [cm]")
+        ax.set_ylabel("y [cm]")
+        ax.set_title(f"Particle positions (N={len(idx)})")
+        fig.tight_layout()
+        fig.savefig(filename, dpi=150)
+        fig.clear()
+        print(f"\nSaved scatter plot to {filename}")
+    except Exception as e:
+        print("\nCould not make scatter plot:", e)
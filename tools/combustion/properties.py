@@ -1,28 +1,101 @@
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+
 import cantera as ct
-import numpy as np
-import matplotlib.pyplot as plt
-import csv
 
-# 1. Define gas mixture and mechanism
-gas = ct.Solution("mechanism.yaml")  # Use a mechanism that includes H2/Air combustion
+MECHANISM = "mechanism.yaml"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "stoicorex", "properties")
+
+
+@functools.lru_cache(maxsize=None)
+def get_gas(mech=MECHANISM):
+    # Parsing the mechanism is the expensive part, do it once per process
+    return ct.Solution(mech)
+
+
+def sweep(T, P, mix, mech=MECHANISM):
+    # Speed of sound [m/s] at every temperature in T, set and evaluated
+    # in one go through a SolutionArray. Scalars are treated as length 1;
+    # for a single state gas.sound_speed is cheaper.
+    import numpy as np
+
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    states = ct.SolutionArray(get_gas(mech), len(T))
+    states.TPY = T, P, mix
+    return states.sound_speed
+
+
+def _mechanism_path(mech):
+    # Same lookup order as Cantera: the path as given, then each of its
+    # data directories. None if the file can't be found on disk.
+    for d in [""] + ct.get_data_directories():
+        path = os.path.join(d, mech)
+        if os.path.isfile(path):
+            return os.path.abspath(path)
+    return None
+
+
+def mixture_properties(T, P, mix, mech=MECHANISM):
+    # Results are cached on disk, keyed by the Cantera version, the
+    # mechanism file (and its mtime) plus the state, so re-runs skip
+    # building the Solution at all
+    path = _mechanism_path(mech)
+    cache_file = None
+    if path is not None:
+        key = (ct.__version__, path, os.path.getmtime(path), T, P, tuple(sorted(mix.items())))
+        cache_file = os.path.join(CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+
+    if cache_file is not None and os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except (EOFError, pickle.UnpicklingError):
+            pass  # damaged entry, recompute and overwrite it below
+
+    gas = get_gas(mech)
+    gas.TPY = T, P, mix
+    props = {"report": gas.report(), "sound_speed": gas.sound_speed}
+
+    if cache_file is not None:
+        # Write to a temp file and rename it into place, so an interrupted
+        # or concurrent run never leaves a half-written pickle behind
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(props, f)
+            os.replace(tmp, cache_file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return props
+
 
-# 2. Set  conditions
-T = 227.0  # Initial temperature [K]
-P = 284.0  # Initial pressure [Pa]
+def main():
+    # 1. Define gas mixture and mechanism
+    mech = MECHANISM  # Use a mechanism that includes H2/Air combustion
 
-# 3. Define the mixture composition as mass fractions
-mix = {"CO2": 0.96, "AR": 0.04}
+    # 2. Set  conditions
+    T = 227.0  # Initial temperature [K]
+    P = 284.0  # Initial pressure [Pa]
 
-# 4. Set the state
-gas.TPY = T, P, mix
+    # 3. Define the mixture composition as mass fractions
+    mix = {"CO2": 0.96, "AR": 0.04}
 
-print(" Mixture ...")
-print(gas.report())
+    # 4. Set the state
+    props = mixture_properties(T, P, mix, mech)
 
-# Compute speed of sound
-a = gas.sound_speed  # [m/s]
+    print(" Mixture ...")
+    print(props["report"])
 
-print(f"Speed of sound: {a:.3f} m/s")
+    # Compute speed of sound
+    a = props["sound_speed"]  # [m/s]
 
+    print(f"Speed of sound: {a:.3f} m/s")
 
 
+if __name__ == "__main__":
+    main()
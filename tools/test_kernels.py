@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import _kernels
+
+numba = pytest.importorskip("numba")
+
+
+def _check_same(pos, nthreads, pad=0.05):
+    expected = _kernels._pos_stats_numpy(pos, pad)
+    got = _kernels._numba_pos_stats()(pos, pad, nthreads)
+    for e, g in zip(expected, got):
+        np.testing.assert_array_equal(g, e)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 7, 8, 9, 1001])
+@pytest.mark.parametrize("nthreads", [1, 4, 8])
+def test_pos_stats_backends_agree(n, nthreads):
+    # Covers n < nthreads and chunk sizes that don't divide n
+    rng = np.random.default_rng(n)
+    _check_same(rng.standard_normal((3, n)), nthreads)
+
+
+def test_pos_stats_constant_axis():
+    rng = np.random.default_rng(0)
+    pos = rng.standard_normal((3, 100))
+    pos[1] = 2.5
+    _check_same(pos, 4)
+
+    _, _, bbox = _kernels._numba_pos_stats()(pos, 0.05, 4)
+    np.testing.assert_allclose(bbox[1], [2.5 - 0.05, 2.5 + 0.05])
+
+
+@pytest.mark.parametrize("where", [0, 3, 99])
+def test_pos_stats_nan_propagates(where):
+    rng = np.random.default_rng(1)
+    pos = rng.standard_normal((3, 100))
+    pos[0, where] = np.nan
+    _check_same(pos, 4)
+
+    lo, hi, _ = _kernels._numba_pos_stats()(pos, 0.05, 4)
+    assert np.isnan(lo[0]) and np.isnan(hi[0])
+    assert not np.isnan(lo[1:]).any()